@@ -1,7 +1,10 @@
-import database as db
 import argparse
+import atexit
 import sys
 
+# short ingredient names accepted on input
+_ALIAS = {"black": "blackberry", "blue": "blueberry"}
+
 
 # parse arguments
 def parse_arguments():
@@ -19,6 +22,9 @@ def parse_arguments():
     # define optional arguments
     parser.add_argument("--ingredients", help="List of ingredients (comma-separated)")
     parser.add_argument("--meals", help="List of meals (comma-separated)")
+    parser.add_argument("--reset", action="store_true",
+                        help="Clear meals, ingredients and measures no recipe uses, "
+                             "then restore the default data")
 
     args = parser.parse_args()
 
@@ -44,6 +50,9 @@ def execute_after_pars(connection, args):
             str: Recipe suggestions based on ingredients and meals, or a message if no recipes match.
 
         """
+    # imported here so --help never loads sqlite3
+    import database as db
+
     # set arguments into SQL queries
     recipe_suggestions = db.find_recipes(connection, args.ingredients, args.meals)
 
@@ -57,8 +66,8 @@ def main():
     """
         Main function for the Food Blog Backend CLI application.
 
-        Parses command-line arguments, initializes the database, populates tables,
-        and handles user interactions.
+        Parses command-line arguments, initializes the database and populates tables
+        when it is new or --reset is passed, and handles user interactions.
 
         Args:
             None
@@ -68,12 +77,13 @@ def main():
         """
     args = parse_arguments()
 
+    # deferred until the arguments are valid, --help never loads sqlite3
+    import database as db
+
     db.db_name = args.database_file
-    # generate database tables
     connection = db.connection(db.db_name)
-    db.generate_tables(connection)
-    # truncate/reset tables[meals, ingredients, measures]
-    db.truncate_tables(connection)
+    # keep a single connection open for the whole run
+    atexit.register(db.close_connection)
 
     # dictionary data for populating tables
     data = {"meals": ("breakfast", "brunch", "lunch", "supper"),
@@ -81,9 +91,20 @@ def main():
                             "blackberry", "sugar"),
             "measures": ("ml", "g", "l", "cup", "tbsp", "tsp", "dsp", "")}
 
-    # insert dict data into tables
-    for key in data.keys():
-        db.insert_many_db(connection, key, data[key])
+    # set up the database only when it is new (or outdated) or a reset is requested
+    if args.reset or not db.tables_exist(connection):
+        # generate database tables
+        db.generate_tables(connection)
+        # truncate/reset tables[meals, ingredients, measures]
+        if args.reset:
+            db.truncate_tables(connection)
+
+        # insert dict data into tables, existing rows are kept
+        for key in data.keys():
+            db.insert_many_db(connection, key, data[key])
+
+    # meal choices shown for every recipe, no need to query them each time
+    meal_names = data["meals"]
 
     if args.meals or args.ingredients:
         # call execute_after_pars()
@@ -102,65 +123,59 @@ def main():
             # user input: recipe description
             recipe_desc = input("Describe recipe: ")
 
-            # populate entries into recipes db table
-            db.insert_to_recipe(connection, recipe_name, recipe_desc)
-
             # print all meals
-            results = db.select_all_db(connection, "meals")
-
-            for index, item in enumerate(results):
-                print(f"{index + 1}) {item[1]}", end=" ")
+            for index, item in enumerate(meal_names):
+                print(f"{index + 1}) {item}", end=" ")
             print()
 
             # ask when dish can be served
             dishes = input("Enter proposed meals separated by a space: ")
             dishes_int = [int(item) for item in dishes.split()]
-            # get all recipes
-            result = db.select_db(connection, "recipes", recipe_name)
+            # map the chosen numbers back to meal names
+            dishes_names = []
             for item in dishes_int:
-                db.insert_to_serve(connection, result[0], item)
-
-            # ingredient information gathering
-            # ingredient_info = " "
+                if 1 <= item <= len(meal_names):
+                    dishes_names.append(meal_names[item - 1])
+                else:
+                    print(f"No meal number {item}, skipped.")
+
+            # ingredient information gathering, one line per ingredient
+            # until an empty line: "<quantity> [measure] <ingredient>"
+            lines = iter(lambda: input("Input quantity of ingredient <press enter to stop>: "), "")
             quantity = []
             ingredient = []
             measure = []
-            while True:
-                ingredient_info = input("Input quantity of ingredient <press enter to stop>: ")
-                if len(ingredient_info) == 0:
-                    break
-                elif len(ingredient_info.split()) == 2:
-                    quant, ing = ingredient_info.split()
-                    quantity.append(quant)
-                    measure.append("")
-                    if ing == "black" or ing == "blue":
-                        ingredient.append(ing + "berry")
-                    else:
-                        ingredient.append(ing)
-                elif len(ingredient_info.split()) == 3:
-                    quant, meas, ing = ingredient_info.split()
-                    quantity.append(quant)
-                    measure.append(meas)
-                    if ing == "black" or ing == "blue":
-                        ingredient.append(ing + "berry")
-                    else:
-                        ingredient.append(ing)
-
-            # insert ingredients
-            result_ing = []
-            for item in ingredient:
-                # db.insert_ingredient_measure(connection, "ingredients", item)
-                result_ing.append(db.select_db(connection, "ingredients", item))
-
-            # insert measure
-            result_mea = []
-            for item in measure:
-                result_mea.append(db.select_db(connection, "measures", item))
-
-            # insert recipe_id, ingredient_id, measure_id, quantity into quantity
-            for i in range(len(quantity)):
-                db.insert_to_quantity(connection, "quantity", quantity[i][0], result[0],
-                                      result_mea[i][0], result_ing[i][0])
+            for line in lines:
+                parts = line.split()
+                if len(parts) == 3:
+                    quant, meas, ing = parts
+                elif len(parts) == 2:
+                    quant, ing = parts
+                    meas = ""
+                else:
+                    continue
+                quantity.append(quant)
+                measure.append(meas)
+                ingredient.append(_ALIAS.get(ing, ing))
+
+            # write the whole recipe in a single transaction
+            with connection:
+                connection.execute("BEGIN")
+
+                # populate entries into recipes db table
+                recipe_id = db.insert_to_recipe(connection, recipe_name, recipe_desc)
+
+                skipped_meals = db.insert_to_serve(connection, [(recipe_id, item) for item in dishes_names])
+
+                # insert quantity, recipe_id, measure and ingredient into quantity
+                rows = [(quant, recipe_id, meas, ing) for quant, meas, ing in zip(quantity, measure, ingredient)]
+                skipped = db.insert_to_quantity(connection, rows)
+
+            # tell the user about meals and ingredient lines that could not be saved
+            for _, meal in skipped_meals:
+                print(f"Unknown meal, skipped: {meal}")
+            for quant, _, meas, ing in skipped:
+                print(f"Unknown measure or ingredient, skipped: {' '.join(filter(None, (quant, meas, ing)))}")
 
 
 if __name__ == "__main__":
@@ -1,9 +1,111 @@
+import re
 import sqlite3
-import functools
 
 # database name
 db_name = ""
 
+# shared connection, reused by every call instead of reconnecting,
+# and the name of the database it is open on
+_CONN = None
+_CONN_DB = None
+
+# map table_name to corresponding attribute
+_ATTR_COLS = {
+    "meals": "meal_name",
+    "ingredients": "ingredient_name",
+    "measures": "measure_name",
+    "recipes": "recipe_name"
+}
+
+# tables and the indexes used by find_recipes, created in one transaction
+_SCHEMA_SQL = """
+        BEGIN;
+        CREATE TABLE IF NOT EXISTS meals(
+        meal_id INTEGER PRIMARY KEY,
+        meal_name TEXT NOT NULL UNIQUE
+        );
+
+        CREATE TABLE IF NOT EXISTS ingredients(
+        ingredient_id INTEGER PRIMARY KEY,
+        ingredient_name TEXT NOT NULL UNIQUE
+        );
+
+        CREATE TABLE IF NOT EXISTS measures(
+        measure_id INTEGER PRIMARY KEY,
+        measure_name TEXT UNIQUE
+        );
+
+        CREATE TABLE IF NOT EXISTS recipes(
+        recipe_id INTEGER PRIMARY KEY,
+        recipe_name TEXT NOT NULL,
+        recipe_description TEXT
+        );
+
+        CREATE TABLE IF NOT EXISTS serve(
+        serve_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        recipe_id INTEGER NOT NULL,
+        meal_id INTEGER NOT NULL,
+        --foreign key for recipes
+        CONSTRAINT fk_recipe FOREIGN KEY(recipe_id) REFERENCES recipes(recipe_id),
+        --foreign key for meals
+        CONSTRAINT fk_meal FOREIGN KEY(meal_id) REFERENCES meals(meal_id)
+        );
+
+        CREATE TABLE IF NOT EXISTS quantity(
+        quantity_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        quantity INTEGER NOT NULL,
+        recipe_id INTEGER NOT NULL,
+        measure_id INTEGER NOT NULL,
+        ingredient_id INTEGER NOT NULL,
+        --foreign key for meal
+        CONSTRAINT fk_measure FOREIGN KEY(measure_id) REFERENCES measures (measure_id),
+        --foreign key for ingredient
+        CONSTRAINT fk_ingredient FOREIGN KEY(ingredient_id) REFERENCES ingredients (ingredient_id),
+        --foreign key for recipe
+        CONSTRAINT fk_recipe_qt FOREIGN KEY(recipe_id) REFERENCES recipes (recipe_id)
+        );
+
+        --indexes for the find_recipes joins
+        CREATE INDEX IF NOT EXISTS idx_quantity_recipe ON quantity(recipe_id);
+        CREATE INDEX IF NOT EXISTS idx_quantity_ing ON quantity(ingredient_id, recipe_id);
+        CREATE INDEX IF NOT EXISTS idx_serve_recipe ON serve(recipe_id, meal_id);
+
+        COMMIT;
+"""
+
+# tables and indexes created by _SCHEMA_SQL, read from the DDL itself so
+# tables_exist() always checks exactly what generate_tables() creates
+_SCHEMA_OBJECTS = tuple(re.findall(r"CREATE (?:TABLE|INDEX) IF NOT EXISTS (\w+)", _SCHEMA_SQL))
+
+# fixed SQL statements, identical text on every call so sqlite3's
+# statement cache serves the compiled program instead of re-parsing it
+_SQL_INSERT_RECIPE = ("INSERT INTO recipes([recipe_name], [recipe_description]) VALUES (?, ?) "
+                      "RETURNING recipe_id;")
+_SQL_INSERT_SERVE = ("INSERT INTO serve([recipe_id], [meal_id]) "
+                     "SELECT ?, meal_id FROM meals WHERE meal_name = ?;")
+_SQL_MEAL_EXISTS = "SELECT 1 FROM meals WHERE meal_name = ?;"
+_SQL_INSERT_QUANTITY = ("INSERT INTO quantity(quantity, [recipe_id], [measure_id], [ingredient_id]) "
+                        "SELECT ?, ?, m.measure_id, i.ingredient_id FROM measures m, ingredients i "
+                        "WHERE m.measure_name = ? AND i.ingredient_name = ?;")
+_SQL_QUANTITY_NAMES_EXIST = ("SELECT 1 FROM measures m, ingredients i "
+                             "WHERE m.measure_name = ? AND i.ingredient_name = ?;")
+
+# recipes that use every given ingredient and are served at any given meal,
+# formatted with the WHERE conditions; the ingredient filter keeps at most
+# len(ingredients) distinct ingredients per recipe, so ">=" means "all of them"
+_SQL_FIND_RECIPES = """
+           SELECT r.recipe_name
+           FROM recipes r
+           JOIN quantity q ON r.recipe_id = q.recipe_id
+           JOIN ingredients i ON q.ingredient_id = i.ingredient_id
+           JOIN serve s ON r.recipe_id = s.recipe_id
+           JOIN meals m ON s.meal_id = m.meal_id
+           WHERE {}
+           GROUP BY r.recipe_id
+           HAVING COUNT(DISTINCT i.ingredient_id) >= ?
+           ;
+           """
+
 
 # connect to database
 def connection(db):
@@ -12,6 +114,8 @@ def connection(db):
 
     This function takes the name of the database file as input and connects to it.
     If the database file doesn't exist, it returns None.
+    The connection is opened once and the same object is returned on later calls
+    for the same database; asking for a different database while it is open raises ValueError.
 
     Args:
         db (str): The name of the database file.
@@ -26,6 +130,14 @@ def connection(db):
         else:
             print("Database file does not exist.")
     """
+    global _CONN, _CONN_DB
+
+    # reuse the open connection to keep the page cache warm
+    if _CONN is not None:
+        if db != _CONN_DB:
+            raise ValueError(f"Already connected to '{_CONN_DB}', close it before opening '{db}'")
+        return _CONN
+
     # Declare the variable before the `if` statement
     db_conn = None
 
@@ -35,19 +147,52 @@ def connection(db):
         db_conn = db  # "{}.db".format(db)
         # print(f"Connected to '{db_conn}' successfully...")
 
-    db_connection = sqlite3.connect(db_conn)
+    db_connection = sqlite3.connect(db_conn, isolation_level=None, check_same_thread=False,
+                                    cached_statements=256)
+
+    # tune the connection: larger pages, WAL journal, fewer fsyncs, bigger
+    # page cache, in-memory temp tables and memory-mapped reads.
+    # page_size only takes effect on a new database, before WAL is enabled
+    db_connection.executescript("""
+        PRAGMA page_size = 8192;
+        PRAGMA journal_mode = WAL;
+        PRAGMA synchronous = NORMAL;
+        PRAGMA cache_size = -65536;
+        PRAGMA temp_store = MEMORY;
+        PRAGMA mmap_size = 536870912;
+        PRAGMA foreign_keys = ON;
+    """)
+
+    _CONN = db_connection
+    _CONN_DB = db
 
     return db_connection
 
 
+def close_connection():
+    """
+    Close the shared database connection opened by `connection()`.
+
+    After closing, the next call to `connection()` opens a fresh connection.
+    Calling it when no connection is open does nothing.
+    """
+    global _CONN, _CONN_DB
+
+    if _CONN is not None:
+        _CONN.close()
+
+    _CONN = None
+    _CONN_DB = None
+
+
 # connect database file
 def db_connect(func):
     """
         Decorator function for connecting to a SQLite database before executing the wrapped function.
 
-        This decorator establishes a connection to a SQLite database and creates a cursor object.
-        It then executes the wrapped function, passing the database connection and cursor as arguments.
-        If any database-related errors occur, they are caught and printed, and the function continues.
+        If the wrapped function is called with None instead of a connection, this decorator
+        opens (or reuses) the connection to the database named by `db_name`.
+        It then executes the wrapped function, passing the database connection as the first argument.
 
         Args:
             func (callable): The function to be wrapped.
@@ -60,15 +205,13 @@ def db_connect(func):
             def my_function(conn, *args, **kwargs):
                 # Your function code here
         """
+    import functools
+
     # inner function
     @functools.wraps(func)
     def wrapper(conn, *args, **kwargs):
-        try:
-            conn.execute("SELECT name FROM sqlite_temp_master WHERE type='table';")
-            # Enable FOREIGN KEY constraints
-            conn.excecute("PRAGMA foreign_keys = ON;")
-
-        except (AttributeError, sqlite3.ProgrammingError):
+        # open (or reuse) the shared connection only when none was passed
+        if conn is None:
             conn = connection(db_name)
 
         return func(conn, *args, **kwargs)
@@ -78,84 +221,59 @@ def db_connect(func):
 
 @db_connect
 def generate_tables(conn):
-    query = """
-        BEGIN;
-        CREATE TABLE IF NOT EXISTS meals(
-        meal_id INTEGER PRIMARY KEY,
-        meal_name TEXT NOT NULL UNIQUE
-        );
+    query = _SCHEMA_SQL
 
-        CREATE TABLE IF NOT EXISTS ingredients(
-        ingredient_id INTEGER PRIMARY KEY,
-        ingredient_name TEXT NOT NULL UNIQUE
-        );
+    with conn:
+        curs = conn.cursor()
+        curs.executescript(query)
 
-        CREATE TABLE IF NOT EXISTS measures(
-        measure_id INTEGER PRIMARY KEY,
-        measure_name TEXT UNIQUE
-        );
 
-        CREATE TABLE IF NOT EXISTS recipes(
-        recipe_id INTEGER PRIMARY KEY,
-        recipe_name TEXT NOT NULL,
-        recipe_description TEXT
-        );
+@db_connect
+def tables_exist(conn):
+    """
+    Check whether the database already holds the full schema.
 
-        CREATE TABLE IF NOT EXISTS serve(
-        serve_id INTEGER PRIMARY KEY AUTOINCREMENT,
-        recipe_id INTEGER NOT NULL,
-        meal_id INTEGER NOT NULL,
-        --foreign key for recipes
-        CONSTRAINT fk_recipe FOREIGN KEY(recipe_id) REFERENCES recipes(recipe_id),
-        --foreign key for meals
-        CONSTRAINT fk_meal FOREIGN KEY(meal_id) REFERENCES meals(meal_id)
-        );
+    :param conn: A SQLite database connection.
+    :return: True if every table and index of the schema exists, False otherwise.
+    """
+    query = (f"SELECT COUNT(*) FROM sqlite_master "
+             f"WHERE name IN ({','.join('?' * len(_SCHEMA_OBJECTS))});")
 
-        CREATE TABLE IF NOT EXISTS quantity(
-        quantity_id INTEGER PRIMARY KEY AUTOINCREMENT,
-        quantity INTEGER NOT NULL,
-        recipe_id INTEGER NOT NULL,
-        measure_id INTEGER NOT NULL,
-        ingredient_id INTEGER NOT NULL,
-        --foreign key for meal
-        CONSTRAINT fk_measure FOREIGN KEY(measure_id) REFERENCES measures (measure_id),
-        --foreign key for ingredient
-        CONSTRAINT fk_ingredient FOREIGN KEY(ingredient_id) REFERENCES ingredients (ingredient_id),
-        --foreign key for recipe
-        CONSTRAINT fk_recipe_qt FOREIGN KEY(recipe_id) REFERENCES recipes (recipe_id)
-        );
+    curs = conn.cursor()
+    curs.execute(query, _SCHEMA_OBJECTS)
 
-        COMMIT;
-    """
+    result = curs.fetchone()[0] == len(_SCHEMA_OBJECTS)
 
-    with conn:
-        curs = conn.cursor()
-        curs.executescript(query)
+    return result
 
 
 # truncate tables in db
 def truncate_tables(conn):
     """
-        Truncate (delete all records from) specified tables in a SQLite database.
+        Truncate (delete the unreferenced records from) specified tables in a SQLite database.
 
         Args:
             conn (sqlite3.Connection): The database connection.
 
         Note:
-            This function deletes all records from the specified tables but keeps the table structures intact.
-            It can be used to reset or clear the data in the specified tables while preserving the table schema.
+            This function deletes the records of the specified tables that no 'serve' or 'quantity' row
+            references, and keeps the table structures intact. Referenced records are kept so FOREIGN KEY
+            integrity holds. It can be used to reset the data in the specified tables before re-seeding them.
 
         Example:
             truncate_tables(connection)
         """
-    tables = ["meals", "ingredients", "measures"]
+    # serve/quantity rows reference these tables; only delete what nothing
+    # references, so FOREIGN KEY checks stay on and no row is left dangling
+    query = """
+        BEGIN;
+        DELETE FROM meals WHERE meal_id NOT IN (SELECT meal_id FROM serve);
+        DELETE FROM ingredients WHERE ingredient_id NOT IN (SELECT ingredient_id FROM quantity);
+        DELETE FROM measures WHERE measure_id NOT IN (SELECT measure_id FROM quantity);
+        COMMIT;
+    """
 
-    with conn:
-        cursor = conn.cursor()
-        for table in tables:
-            query = f"DELETE FROM {table};"
-            cursor.execute(query)
-    conn.commit()
+    conn.executescript(query)
 
 
 def attribute_conf(table_name):
@@ -171,333 +289,160 @@ def attribute_conf(table_name):
     :return: The name of the corresponding attribute column.
     :rtype: str or None
     """
-    # map table_name to corresponding attribute
-    attribute_columns = {
-        "meals": "meal_name",
-        "ingredients": "ingredient_name",
-        "measures": "measure_name",
-        "recipes": "recipe_name"
-    }
-    attribute_column = attribute_columns.get(table_name)
-    return attribute_column
+    return _ATTR_COLS.get(table_name)
 
 
 @db_connect
-def insert_db(conn, *args):
-    """
-        Insert a new record into a SQLite database table.
-
-        Args:
-            conn (sqlite3.Connection): The database connection.
-            table_name (str): The name of the table to insert the record into.
-            attribute_value (str): The attribute value to insert into the specified table.
-
-        Raises:
-            ValueError: If the number of arguments is not 2 or if the table name is unsupported.
-
-        Note:
-            The function uses the "INSERT INTO" SQL statement to add a new record to the specified table.
-            It assumes that the table structure and relationships are properly set up.
-
-        Example:
-            insert_db(connection, "meals", "breakfast")
-        """
-    # ensure there are exactly three args
-    if len(args) != 2:
-        raise ValueError("Function requires exactly 2 arguments: \
-                         table_name, attribute_value")
-
-    # assign args to variables
-    table_name, attribute_value = args
-
-    attribute_column = attribute_conf(table_name)
-    if attribute_column is None:
-        raise ValueError(f"Unsupported table name: {table_name}")
-
-    # Use INSERT OR REPLACE to insert or update based on conflicts
-    query = f"INSERT INTO ({attribute_column}) VALUES (:value);"
-    # print("query:", query)
-    # print("attribute value: ", attribute_value, " ", type(attribute_value))
-    with conn:
-        curs = conn.cursor()
-        curs.execute(query, {"value": attribute_value})
-
-    conn.commit()
-
-
-@db_connect
-def insert_to_recipe(conn, *args):
+def insert_to_recipe(conn, recipe_name, recipe_desc):
     """
         Insert a new recipe into the 'recipes' table.
 
         Args:
             conn (sqlite3.Connection): The database connection.
             recipe_name (str): The name of the recipe.
-            recipe_description (str): The description of the recipe.
+            recipe_desc (str): The description of the recipe.
 
-        Raises:
-            ValueError: If the number of arguments is not 2.
+        Returns:
+            int: The ID of the new recipe.
 
         Note:
-            The function uses the "INSERT INTO" SQL statement to add a new recipe to the 'recipes' table.
+            The function uses the "INSERT INTO ... RETURNING" SQL statement to add a new recipe to the
+            'recipes' table and read back its ID in the same statement.
             It assumes that the 'recipes' table structure and relationships are properly set up.
 
         Example:
             insert_to_recipe(connection, "Pancakes", "Delicious breakfast pancakes with syrup.")
         """
-    # ensure there are exactly three args
-    if len(args) != 2:
-        raise ValueError("Function requires exactly 2 arguments: \
-                          recipe_name and recipe_description")
-
-    # assign args to variables
-    recipe_name, recipe_desc = args
-
     # Use INSERT OR REPLACE to insert or update based on conflicts
-    query = f"INSERT INTO recipes([recipe_name], [recipe_description]) VALUES (:value1, :value2);"
+    query = _SQL_INSERT_RECIPE
     # print("query:", query)
     # print("Name: ", recipe_name, " Description: ", recipe_desc)
-    with conn:
-        curs = conn.cursor()
-        curs.execute(query, {"value1": recipe_name, "value2": recipe_desc})
-
-    conn.commit()
-
-
-@db_connect
-def insert_to_serve(conn, *args):
-    """
-        Insert a recipe-to-meal association into the 'serve' table.
-
-        Args:
-            conn (sqlite3.Connection): The database connection.
-            recipe_id (int): The ID of the recipe to associate.
-            meal_id (int): The ID of the meal to associate.
-
-        Raises:
-            ValueError: If the number of arguments is not 2.
-
-        Note:
-            The function uses the "INSERT INTO" SQL statement to create an association between a recipe and a meal
-            in the 'serve' table. It assumes that the 'serve' table structure and relationships are properly set up.
-
-        Example:
-            insert_to_serve(connection, 1, 3)
-        """
-    # ensure there are exactly three args
-    if len(args) != 2:
-        raise ValueError("Function requires exactly 2 arguments: \
-                          recipe_id and meal_id")
-
-    # assign args to variables
-    recipe_id, meal_id = args
+    # no commit here: autocommits on its own, or joins the caller's transaction
+    curs = conn.cursor()
+    curs.execute(query, (recipe_name, recipe_desc))
 
-    # Use INSERT OR REPLACE to insert or update based on conflicts
-    query = f"INSERT INTO serve([recipe_id], [meal_id]) VALUES (:value1, :value2);"
-    # print("Serve query:", query)
-    # print("Recipe: ", recipe_id, " Meal: ", meal_id)
-    with conn:
-        curs = conn.cursor()
-        curs.execute(query, {"value1": recipe_id, "value2": meal_id})
+    recipe_id = curs.fetchone()[0]
 
-    conn.commit()
+    return recipe_id
 
 
 @db_connect
-def insert_ingredient_measure(conn, *args):
+def insert_to_serve(conn, rows):
     """
-        Insert an ingredient or measure into the specified table.
+        Insert recipe-to-meal associations into the 'serve' table.
 
         Args:
             conn (sqlite3.Connection): The database connection.
-            table_name (str): The name of the table to insert data into (e.g., 'ingredients' or 'measures').
-            attribute_value (str): The value of the ingredient or measure.
+            rows (iterable): (recipe_id, meal_name) tuples to associate.
 
-        Raises:
-            ValueError: If the number of arguments is not 2 or if the provided table_name is unsupported.
+        Returns:
+            list: The rows that were not inserted because their meal is unknown.
 
         Note:
-            The function uses the "INSERT INTO" SQL statement to add the ingredient or measure to the table.
-            It assumes that the table structure and relationships are properly set up.
+            The function uses the "INSERT INTO ... SELECT" SQL statement with executemany to create the
+            associations between a recipe and its meals in the 'serve' table in one call, resolving meal
+            names to their IDs inside SQLite. Rows naming an unknown meal are not inserted and are
+            returned to the caller.
+            It assumes that the 'serve' table structure and relationships are properly set up.
 
         Example:
-            insert_ingredient_measure(connection, 'ingredients', 'strawberry')
+            insert_to_serve(connection, [(1, "lunch"), (1, "supper")])
         """
-    # ensure there are exactly three args
-    if len(args) != 2:
-        raise ValueError("Function requires exactly 2 arguments: \
-                          table_name and ingredient_name")
-
-    # assign args to variables
-    table_name, attribute_value = args
+    rows = list(rows)
 
-    attribute_column = attribute_conf(table_name)
-    if attribute_column is None:
-        raise ValueError(f"Unsupported table name: {table_name}")
-
-    # Use INSERT OR REPLACE to insert or update based on conflicts
-    query = f"INSERT INTO {table_name}({attribute_column}) VALUES (:value);"
+    query = _SQL_INSERT_SERVE
     # print("Serve query:", query)
-    with conn:
-        curs = conn.cursor()
-        curs.execute(query, {"value": attribute_value})
+    # no commit here: autocommits on its own, or joins the caller's transaction
+    curs = conn.cursor()
+    # Use executemany to insert multiple rows
+    curs.executemany(query, rows)
 
-    conn.commit()
+    # some rows were not inserted, find the ones naming an unknown meal
+    skipped = []
+    if curs.rowcount != len(rows):
+        for row in rows:
+            curs.execute(_SQL_MEAL_EXISTS, row[1:])
+            if curs.fetchone() is None:
+                skipped.append(row)
+
+    return skipped
 
 
 @db_connect
-def insert_to_quantity(conn, *args):
+def insert_to_quantity(conn, rows):
     """
-        Insert quantity information into the specified table.
+        Insert quantity information into the 'quantity' table.
 
         Args:
             conn (sqlite3.Connection): The database connection.
-            table_name (str): The name of the table to insert data into.
-            quantity (int): The quantity value.
-            recipe_id (int): The recipe ID.
-            measure_id (int): The measure ID.
-            ingredient_id (int): The ingredient ID.
+            rows (iterable): (quantity, recipe_id, measure_name, ingredient_name) tuples.
 
-        Raises:
-            ValueError: If the number of arguments is not 5.
+        Returns:
+            list: The rows that were not inserted because their measure or ingredient is unknown.
 
         Note:
-            The function uses the "INSERT INTO" SQL statement to add quantity information to the table.
+            The function uses the "INSERT INTO ... SELECT" SQL statement with executemany to add all quantity
+            information of a recipe to the table in one call, resolving measure and ingredient names to
+            their IDs inside SQLite. Rows naming an unknown measure or ingredient are not inserted
+            and are returned to the caller.
             It assumes that the table structure and relationships are properly set up.
 
         Example:
-            insert_to_quantity(connection, 'quantity', 5, 1, 1, 2)
+            insert_to_quantity(connection, [(5, 1, "", "milk"), (1, 1, "cup", "strawberry")])
         """
-    # ensure there are exactly three args
-    if len(args) != 5:
-        raise ValueError("Function requires exactly 5 arguments: \
-                          table_name, quantity, recipe_id, meal_id, ingredient_id")
+    rows = list(rows)
 
-    # assign args to variables
-    table_name, quantity, recipe_id, measure_id, ingredient_id = args
+    query = _SQL_INSERT_QUANTITY
+    # print("SERVE: ", rows)
+    # no commit here: autocommits on its own, or joins the caller's transaction
+    curs = conn.cursor()
+    # Use executemany to insert multiple rows
+    curs.executemany(query, rows)
 
-    # Use INSERT OR REPLACE to insert or update based on conflicts
-    query = (f"INSERT INTO {table_name}(quantity, [recipe_id], "
-             f"[measure_id], [ingredient_id]) VALUES (:value1, :value2, "
-             f":value3, :value4);")
-    # print("SERVE: ")
-    # print("Recipe id: ", recipe_id, "Quantity id:", quantity, " Measure id: ", measure_id,
-    #      " Ingredient id: ", ingredient_id)
-    with conn:
-        curs = conn.cursor()
-        curs.execute(query, {"value1": quantity, "value2": recipe_id,
-                             "value3": measure_id, "value4": ingredient_id})
+    # some rows were not inserted, find the ones naming an unknown measure or ingredient
+    skipped = []
+    if curs.rowcount != len(rows):
+        for row in rows:
+            curs.execute(_SQL_QUANTITY_NAMES_EXIST, row[2:])
+            if curs.fetchone() is None:
+                skipped.append(row)
 
-    conn.commit()
+    return skipped
 
 
 @db_connect
-def insert_many_db(conn, *args):
+def insert_many_db(conn, table_name, attribute_values):
     """
-    Insert a new record into a SQLite database table.
+    Insert new records into a SQLite database table.
 
     This function performs an SQL INSERT operation on the specified table,
-     adding a new record with the specified attribute and value.
+     adding one record per attribute value. Values already present in a
+     UNIQUE column are skipped, so repeating an insert is a no-op.
 
     :param conn: A SQLite database connection.
-    :param args: Positional arguments representing the table name,
-    :and attribute value for the new record.
+    :param table_name: The name of the table to insert into.
+    :param attribute_values: The attribute values of the new records.
     :return: None
     """
-    # ensure there are exactly three args
-    if len(args) != 2:
-        raise ValueError("Function requires exactly 2 arguments: \
-                         table_name, attribute_value")
-
-    # assign args to variables
-    table_name, attribute_values = args
-
     # get attribute name
-    attribute_column = attribute_conf(table_name)
+    attribute_column = _ATTR_COLS.get(table_name)
     if attribute_column is None:
         raise ValueError(f"Unsupported table name: {table_name}")
 
-    # Use INSERT OR REPLACE to insert or update based on conflicts
-    query = f"INSERT INTO {table_name} ({attribute_column}) VALUES (:value);"
+    # Use INSERT OR IGNORE to skip values that already exist
+    query = f"INSERT OR IGNORE INTO {table_name} ({attribute_column}) VALUES (?);"
     # print("query:", query)
     # print("attribute value: ", attribute_values, " ", type(attribute_values))
+    # the connection autocommits, so open a transaction to commit the batch once
     with conn:
+        conn.execute("BEGIN")
         curs = conn.cursor()
         # Use executemany to insert multiple rows
-        curs.executemany(query, [{"value": value} for value in attribute_values])
-
-    conn.commit()
-
-
-@db_connect
-def db_update(conn, *args):
-    """
-    Update a record in a SQLite database table.
-
-    This function performs an SQL UPDATE operation on the specified table, setting a specific attribute to a new value.
-
-    :param conn: A SQLite database connection.
-    :param args: Positional arguments representing the table name, attribute to update, and the new attribute value.
-    :return: None
-    """
-    # ensure there are exactly three args
-    if len(args) != 3:
-        raise ValueError("Function requires exactly 3 arguments: \
-                         table_name, attribute, and attribute_value")
-
-    # assign args to variables
-    table_name, attribute_value = args
-
-    # get attribute name
-    attribute_column = attribute_conf(table_name)
-    if attribute_column is None:
-        raise ValueError(f"Unsupported table name: {table_name}")
-
-    query = f"UPDATE {table_name} SET {attribute_column} = :value;"
-    with conn:
-        curs = conn.cursor()
-        curs.execute(query, {"value": attribute_value})
-
-    conn.commit()
-
-
-@db_connect
-def db_remove(conn, *args):
-    """
-    Remove records from a SQLite database table based on a specified
-    attribute value.
-
-    This function performs an SQL DELETE operation on the specified table,
-     removing records where the specified attribute matches a given value.
-
-    :param conn: A SQLite database connection.
-    :param args: Positional arguments representing the table name,
-    attribute to match for deletion, and the attribute value to match.
-    :return: None
-    """
-    # ensure there are exactly three args
-    if len(args) != 3:
-        raise ValueError("Function requires exactly 3 arguments: \
-                         table_name, attribute, and attribute_value")
-
-    # assign args to variables
-    table_name, attribute_value = args
-
-    # get attribute name
-    attribute_column = attribute_conf(table_name)
-    if attribute_column is None:
-        raise ValueError(f"Unsupported table name: {table_name}")
-
-    query = f"DELETE FROM {table_name} WHERE {attribute_column} = :value;"
-    with conn:
-        curs = conn.cursor()
-        curs.execute(query, {"value": attribute_value})
-
-    conn.commit()
+        curs.executemany(query, [(value,) for value in attribute_values])
 
 
 @db_connect
-def select_db(conn, *args):
+def select_db(conn, table_name, attribute_value):
     """
     Retrieve a record from a SQLite database table based on a specified
     attribute value.
@@ -506,121 +451,77 @@ def select_db(conn, *args):
      retrieving a record where the specified attribute matches a given value.
 
     :param conn: A SQLite database connection.
-    :param args: Positional arguments representing the table name,
-    attribute name, and attribute value for selection.
+    :param table_name: The name of the table to select from.
+    :param attribute_value: The attribute value to match.
     :return: A single row resulting from the query, or None if no match
     is found.
     """
-    # ensure there are exactly three args
-    if len(args) != 2:
-        raise ValueError("Function requires exactly 3 arguments: \
-                         table_name, attribute, and attribute_value")
-
-    # assign args to variables
-    table_name, attribute_value = args
-
     # get attribute name
-    attribute_column = attribute_conf(table_name)
+    attribute_column = _ATTR_COLS.get(table_name)
     if attribute_column is None:
         raise ValueError(f"Unsupported table name: {table_name}")
 
-    query = f"SELECT * FROM {table_name} WHERE {attribute_column} = :value;"
+    query = f"SELECT * FROM {table_name} WHERE {attribute_column} = ?;"
     # print("Measure values in query function: ", table_name, " ", attribute_value)
 
     curs = conn.cursor()
-    curs.execute(query, {"value": attribute_value})
+    curs.execute(query, (attribute_value,))
 
     result = curs.fetchone()
 
-    conn.close()
-
     return result
 
 
 @db_connect
-def select_all_db(conn, *args):
+def select_all_db(conn, table_name):
     """
     Retrieve all records from a SQLite database table based on a specified
     table name.
 
     :param conn: A SQLite database connection.
-    :param args: Positional argument representing the table name
+    :param table_name: The name of the table to select from.
     :return: A multiple rows resulting from the query, or None if no match
     is found.
     """
-    # ensure there are exactly three args
-    if len(args) != 1:
-        raise ValueError("Function requires exactly 1 argument1: \
-                         table_name")
-
-    # assign args to variables
-    table_name = args
-    # print(" TABLE NAME: ", table_name[0])
-    query = f"SELECT * FROM {table_name[0]};"
+    # print(" TABLE NAME: ", table_name)
+    query = f"SELECT * FROM {table_name};"
     curs = conn.cursor()
     curs.execute(query)
 
     result = curs.fetchall()
 
-    conn.close()
-
     return result
 
 
 @db_connect
-def find_recipes(conn, *args):
+def find_recipes(conn, ingredients, meals):
     """
         Retrieve recipe names based on specified ingredients and meals.
 
         Args:
             conn (sqlite3.Connection): The database connection.
-            *args: Variable-length arguments, where the first argument is
-                   a list of ingredients and the second argument is a list of meals.
+            ingredients (list or None): Ingredients the recipe must contain, None for any.
+            meals (list or None): Meals at which the recipe may be served, None for any.
 
         Returns:
             str: A comma-separated string of recipe names that match the criteria.
         """
-    ingredients, meals = args
-
-    if len(ingredients) == 1:
-        query = """
-               SELECT r.recipe_name
-               FROM recipes r
-               JOIN quantity q ON r.recipe_id = q.recipe_id
-               JOIN ingredients i ON q.ingredient_id = i.ingredient_id
-               JOIN serve s ON r.recipe_id = s.recipe_id
-               JOIN meals m ON s.meal_id = m.meal_id
-               WHERE (i.ingredient_name = 'cacao')
-               AND (m.meal_name IN ({}))
-               GROUP BY m.meal_name
-               ;
-               """.format(
-            ",".join([f"'{meal}'" for meal in meals]))
-    else:
-        query = """
-           SELECT r.recipe_name
-           FROM recipes r
-           JOIN quantity q ON r.recipe_id = q.recipe_id
-           JOIN ingredients i ON q.ingredient_id = i.ingredient_id
-           JOIN serve s ON r.recipe_id = s.recipe_id
-           JOIN meals m ON s.meal_id = m.meal_id
-           WHERE ({})
-           AND (m.meal_name IN ({}))
-           GROUP BY r.recipe_name
-           HAVING COUNT(DISTINCT i.ingredient_name) = {}
-           ;
-           """.format(
-            " OR ".join([f"i.ingredient_name ='{ingredient}'" for ingredient in ingredients]),
-            ",".join([f"'{meal}'" for meal in meals]),
-            len(ingredients))
+    ingredients = ingredients or []
+    meals = meals or []
+
+    # only filter on the lists that were given
+    conditions = []
+    if ingredients:
+        conditions.append(f"(i.ingredient_name IN ({','.join('?' * len(ingredients))}))")
+    if meals:
+        conditions.append(f"(m.meal_name IN ({','.join('?' * len(meals))}))")
+    query = _SQL_FIND_RECIPES.format(" AND ".join(conditions) or "1")
 
     curs = conn.cursor()
-    curs.execute(query)
+    curs.execute(query, (*ingredients, *meals, len(set(ingredients))))
     result = curs.fetchall()
 
     # Extract recipe names from the result and join them with a comma
     recipe_names = ", ".join(recipe[0] for recipe in result)
 
-    conn.close()
-
     return recipe_names
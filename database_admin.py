@@ -0,0 +1,77 @@
+from database import attribute_conf, db_connect, insert_many_db
+
+# maintenance helpers, kept out of database.py so the CLI imports less
+
+
+@db_connect
+def insert_db(conn, table_name, attribute_value):
+    """
+        Insert a new record into a SQLite database table.
+
+        Args:
+            conn (sqlite3.Connection): The database connection.
+            table_name (str): The name of the table to insert the record into.
+            attribute_value (str): The attribute value to insert into the specified table.
+
+        Raises:
+            ValueError: If the table name is unsupported.
+
+        Note:
+            The function delegates to insert_many_db, so every insert goes through executemany.
+            It assumes that the table structure and relationships are properly set up.
+
+        Example:
+            insert_db(connection, "meals", "breakfast")
+        """
+    # a single row is a batch of one
+    insert_many_db(conn, table_name, (attribute_value,))
+
+
+@db_connect
+def db_update(conn, table_name, old_value, new_value):
+    """
+    Update a record in a SQLite database table.
+
+    This function performs an SQL UPDATE operation on the specified table, setting the attribute
+    of the records that currently hold `old_value` to `new_value`.
+
+    :param conn: A SQLite database connection.
+    :param table_name: The name of the table to update.
+    :param old_value: The attribute value of the records to update.
+    :param new_value: The new attribute value.
+    :return: None
+    """
+    # get attribute name
+    attribute_column = attribute_conf(table_name)
+    if attribute_column is None:
+        raise ValueError(f"Unsupported table name: {table_name}")
+
+    query = f"UPDATE {table_name} SET {attribute_column} = ? WHERE {attribute_column} = ?;"
+    # single statement, committed by the autocommit connection
+    curs = conn.cursor()
+    curs.execute(query, (new_value, old_value))
+
+
+@db_connect
+def db_remove(conn, table_name, attribute_value):
+    """
+    Remove records from a SQLite database table based on a specified
+    attribute value.
+
+    This function performs an SQL DELETE operation on the specified table,
+     removing records where the specified attribute matches a given value.
+
+    :param conn: A SQLite database connection.
+    :param table_name: The name of the table to delete from.
+    :param attribute_value: The attribute value to match for deletion.
+    :return: None
+    """
+    # get attribute name
+    attribute_column = attribute_conf(table_name)
+    if attribute_column is None:
+        raise ValueError(f"Unsupported table name: {table_name}")
+
+    query = f"DELETE FROM {table_name} WHERE {attribute_column} = ?;"
+    # single statement, committed by the autocommit connection
+    curs = conn.cursor()
+    curs.execute(query, (attribute_value,))